@@ -0,0 +1,21 @@
+"""
+Shared helpers for the DXCC maintenance scripts.
+"""
+
+import json
+from pathlib import Path
+
+def load_dxcc_entities(json_path: Path) -> list[dict]:
+    """Load dxcc_entities.json, parsing the raw bytes without a decode step."""
+    return json.loads(json_path.read_bytes())
+
+_INDENT_ENCODER = json.JSONEncoder(indent=2)
+
+def write_json(json_path: Path, data):
+    """Write data as indented JSON, same bytes as json.dump(data, f, indent=2).
+
+    Encoded fragments are streamed through the file's buffer, so the whole
+    document is never held in memory as one string.
+    """
+    with open(json_path, 'w') as f:
+        f.writelines(_INDENT_ENCODER.iterencode(data))
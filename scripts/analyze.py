@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Analyze DXCC prefix coverage and accuracy.
+
+Runs both reports from a single load of dxcc_entities.json:
+- Coverage: are all DXCC entities reachable via a PrefixRule in prefixes.rs?
+- Prefixes: which entities have a unique prefix, and which need disambiguation?
+
+analyze_coverage.py and analyze_prefixes.py run one report each.
+"""
+
+import mmap
+import os
+import re
+import sys
+from pathlib import Path
+from collections import Counter, defaultdict, namedtuple
+
+from _common import load_dxcc_entities
+
+BASE = Path(__file__).parent.parent
+JSON_PATH = BASE / "src-tauri" / "resources" / "dxcc_entities.json"
+RS_PATH = BASE / "src-tauri" / "src" / "reference" / "prefixes.rs"
+
+# Match: PrefixRule { prefix: "XX", entity_id: NNN
+# Bytes pattern: prefixes.rs is ASCII source and is scanned straight from
+# an mmap, so \s and \d are plain byte classes and nothing is decoded.
+_RULE_RE = re.compile(rb'PrefixRule\s*\{\s*prefix:\s*"([^"]+)",\s*entity_id:\s*(\d+)')
+
+# The entity fields the reports read, normalized at load
+# raw_prefixes is the JSON value as-is (None when the key is null, 'NONE'
+# when it is absent), for reports that echo it back
+Entity = namedtuple('Entity', 'id name deleted continent prefixes raw_prefixes')
+
+def _norm_prefixes(p) -> list[str]:
+    """Prefixes as a list of interned strings: None -> [], "XX" -> ["XX"]."""
+    if isinstance(p, str):
+        return [sys.intern(p)]
+    return [sys.intern(x) for x in p] if p else []
+
+def _load(json_path: Path = JSON_PATH) -> tuple[list[Entity], dict]:
+    """Load entities once as Entity records. Returns (entities, by_id)."""
+    entities = [
+        Entity(int(e['EntityId']), e['Name'], bool(e.get('Deleted')),
+               sys.intern(e.get('Continent', 'Unknown')), _norm_prefixes(e.get('Prefixes')),
+               e.get('Prefixes', 'NONE'))
+        for e in load_dxcc_entities(json_path)
+    ]
+    by_id = {e.id: e for e in entities}
+    return entities, by_id
+
+def coverage_report(entities: list[Entity], by_id: dict, rs_path: Path = RS_PATH) -> list[str]:
+    """Report which entities have a PrefixRule in prefixes.rs."""
+    # Parse prefixes.rs for entity_ids used
+    with open(rs_path, 'rb') as f:
+        # mmap refuses empty files; an empty prefixes.rs has no rules
+        if os.fstat(f.fileno()).st_size == 0:
+            rs_rules = []
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                rs_rules = _RULE_RE.findall(mm)
+
+    # Which entity_ids are covered by prefix rules?
+    covered_ids = set(int(eid) for _, eid in rs_rules)
+
+    # Single pass: active entities and coverage by continent
+    active_entities = {}
+    total_by_cont = Counter()
+    covered_by_cont = Counter()
+    for e in entities:
+        if e.deleted:
+            continue
+        active_entities[e.id] = e.name
+        total_by_cont[e.continent] += 1
+        covered_by_cont[e.continent] += e.id in covered_ids
+
+    out = []
+    out.append("=== DXCC PREFIX COVERAGE ANALYSIS ===\n")
+    out.append(f"Active DXCC entities (ARRL official): {len(active_entities)}")
+    out.append(f"Unique entity_ids in prefixes.rs: {len(covered_ids)}")
+    out.append(f"Total prefix rules: {len(rs_rules)}")
+
+    # Entities NOT covered by any prefix rule
+    active_ids = active_entities.keys()
+    uncovered = active_ids - covered_ids
+    out.append(f"\n=== ENTITIES WITH NO PREFIX RULE ({len(uncovered)}) ===")
+    for eid in sorted(uncovered):
+        name = active_entities[eid]
+        # Find what JSON says about this entity's prefix
+        prefixes = by_id[eid].raw_prefixes
+        out.append(f"  {eid}: {name} - JSON prefixes: {prefixes}")
+
+    # Entity_ids in prefixes.rs that DON'T exist in active entities
+    invalid_ids = covered_ids - active_ids
+    if invalid_ids:
+        out.append(f"\n=== INVALID ENTITY_IDs IN CODE ({len(invalid_ids)}) ===")
+        for eid in sorted(invalid_ids):
+            # Find what this ID actually is
+            e = by_id.get(eid)
+            if e is None:
+                out.append(f"  {eid}: NOT IN JSON AT ALL")
+            else:
+                status = "DELETED" if e.deleted else "???"
+                out.append(f"  {eid}: {e.name} ({status})")
+
+    # Coverage by continent
+    out.append(f"\n=== COVERAGE BY CONTINENT ===")
+    for cont in sorted(total_by_cont):
+        total, covered = total_by_cont[cont], covered_by_cont[cont]
+        pct = 100 * covered / total if total > 0 else 0
+        out.append(f"  {cont}: {covered}/{total} ({pct:.0f}%)")
+
+    # Summary
+    covered_active = active_ids & covered_ids
+    coverage_pct = 100 * len(covered_active) / len(active_entities)
+    out.append(f"\n=== SUMMARY ===")
+    out.append(f"Entity coverage: {len(covered_active)}/{len(active_entities)} ({coverage_pct:.1f}%)")
+    out.append(f"Uncovered entities: {len(uncovered)}")
+    out.append(f"Invalid entity_ids in code: {len(invalid_ids)}")
+
+    return out
+
+def prefix_report(entities: list[Entity]) -> list[str]:
+    """Report which active entities can be identified by a unique prefix."""
+    active = [e for e in entities if not e.deleted]
+
+    out = []
+
+    # Entities with no prefix data
+    no_prefix = [e for e in active if not e.prefixes]
+    out.append(f"Active entities with NO prefix data: {len(no_prefix)}")
+    for e in no_prefix:
+        out.append(f"  - {e.id:03d}: {e.name}")
+    out.append("")
+
+    # Count entities that have UNIQUE prefixes (unambiguous)
+    prefix_to_entities = defaultdict(list)
+    entities_with_unique_prefix = []
+    entities_with_shared_prefix = []
+
+    # Non-range prefixes, kept as a column parallel to `active`
+    prefix_lists = [[p for p in e.prefixes if not (len(p) > 3 and '-' in p)] for e in active]
+    for e, prefixes in zip(active, prefix_lists):
+        for p in prefixes:
+            prefix_to_entities[p].append(e)
+
+    # Categorize entities
+    for e, prefixes in zip(active, prefix_lists):
+        if not e.prefixes:
+            continue
+
+        # Check if ANY of this entity's prefixes are unique
+        has_unique = any(len(prefix_to_entities[p]) == 1 for p in prefixes)
+
+        if has_unique:
+            entities_with_unique_prefix.append(e)
+        else:
+            entities_with_shared_prefix.append(e)
+
+    out.append(f"Entities with at least one unique prefix: {len(entities_with_unique_prefix)}")
+    out.append(f"Entities with ONLY shared prefixes: {len(entities_with_shared_prefix)}")
+    out.append("")
+
+    out.append("=== ENTITIES WITH ONLY SHARED PREFIXES (need disambiguation) ===")
+    for e in entities_with_shared_prefix:
+        out.append(f"  {e.id:03d}: {e.name} - prefixes: {e.prefixes}")
+
+    # Summary
+    out.append("")
+    out.append("=== ACCURACY SUMMARY ===")
+    total_active = len(active)
+    has_prefix = total_active - len(no_prefix)
+    unique_prefix = len(entities_with_unique_prefix)
+    shared_prefix = len(entities_with_shared_prefix)
+
+    out.append(f"Total active entities: {total_active}")
+    out.append(f"Entities with prefix data: {has_prefix} ({100*has_prefix/total_active:.1f}%)")
+    out.append(f"Entities with unique prefix (100% accurate): {unique_prefix} ({100*unique_prefix/total_active:.1f}%)")
+    out.append(f"Entities needing disambiguation: {shared_prefix} ({100*shared_prefix/total_active:.1f}%)")
+    out.append(f"Entities with no prefix: {len(no_prefix)} ({100*len(no_prefix)/total_active:.1f}%)")
+
+    return out
+
+def main_coverage():
+    entities, by_id = _load()
+    sys.stdout.write("\n".join(coverage_report(entities, by_id)) + "\n")
+
+def main_prefixes():
+    entities, _ = _load()
+    sys.stdout.write("\n".join(prefix_report(entities)) + "\n")
+
+def main():
+    entities, by_id = _load()
+    out = coverage_report(entities, by_id)
+    out.append("")
+    out.extend(prefix_report(entities))
+    sys.stdout.write("\n".join(out) + "\n")
+
+if __name__ == "__main__":
+    main()
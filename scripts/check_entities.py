@@ -1,18 +1,28 @@
 #!/usr/bin/env python3
 """Check specific entity IDs that have errors."""
 
-import json
+import sys
 from pathlib import Path
 
+from _common import load_dxcc_entities
+
 base = Path(__file__).parent.parent
 json_path = base / "src-tauri" / "resources" / "dxcc_entities.json"
 
-with open(json_path) as f:
-    entities = json.load(f)
+entities = load_dxcc_entities(json_path)
 
-# Build lookup
+# Build lookups
 by_id = {int(e['EntityId']): e for e in entities}
 
+# prefix -> entities listing it, in JSON order
+prefix_to_entries = {}
+for e in entities:
+    prefixes = e.get('Prefixes') or []
+    if isinstance(prefixes, str):
+        prefixes = [prefixes]
+    for p in prefixes:
+        prefix_to_entries.setdefault(p, []).append(e)
+
 # Check the error cases - what the code has vs what JSON says
 error_cases = [
     # (prefix, code_has, json_should_have_according_to_error)
@@ -29,20 +39,19 @@ error_cases = [
     ("GI", 279, 265),
 ]
 
-print("=== ENTITY ID VERIFICATION ===")
-print()
+out = []
+out.append("=== ENTITY ID VERIFICATION ===")
+out.append("")
 for prefix, code_id, json_id in error_cases:
     code_name = by_id.get(code_id, {}).get('Name', 'UNKNOWN')
     json_name = by_id.get(json_id, {}).get('Name', 'UNKNOWN')
-    print(f"{prefix}:")
-    print(f"  Code has:    {code_id} = {code_name}")
-    print(f"  JSON wants:  {json_id} = {json_name}")
+    out.append(f"{prefix}:")
+    out.append(f"  Code has:    {code_id} = {code_name}")
+    out.append(f"  JSON wants:  {json_id} = {json_name}")
     
     # Find what JSON actually says for this prefix
-    for e in entities:
-        prefixes = e.get('Prefixes') or []
-        if isinstance(prefixes, str):
-            prefixes = [prefixes]
-        if prefix in prefixes:
-            print(f"  JSON actual: {e['EntityId']} = {e['Name']} (Deleted: {e.get('Deleted', False)})")
-    print()
+    for e in prefix_to_entries.get(prefix, []):
+        out.append(f"  JSON actual: {e['EntityId']} = {e['Name']} (Deleted: {e.get('Deleted', False)})")
+    out.append("")
+
+sys.stdout.write("\n".join(out) + "\n")
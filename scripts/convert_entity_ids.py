@@ -10,12 +10,13 @@ import json
 from pathlib import Path
 from datetime import datetime, timezone
 
+from _common import write_json
+
 def main():
     json_path = Path(__file__).parent.parent / "src-tauri" / "resources" / "prefix_rules.json"
     
     print(f"Reading: {json_path}")
-    with open(json_path, 'r') as f:
-        data = json.load(f)
+    data = json.loads(json_path.read_bytes())
     
     # Check if already converted
     sample = data['rules'][0]['entity_id']
@@ -26,8 +27,14 @@ def main():
     print(f"Converting {len(data['rules'])} rules...")
     
     # Convert all entity_id values to 3-digit strings
+    # Many rules share an entity; format each id once
+    fmt_cache = {}
     for rule in data['rules']:
-        rule['entity_id'] = f"{rule['entity_id']:03d}"
+        eid = rule['entity_id']
+        eid_str = fmt_cache.get(eid)
+        if eid_str is None:
+            eid_str = fmt_cache[eid] = f"{eid:03d}"
+        rule['entity_id'] = eid_str
     
     # Update metadata
     data['version'] = '2.0.0'
@@ -35,12 +42,10 @@ def main():
     data['source'] = 'Converted from v1.x - entity_id now uses ARRL 3-digit string format'
     
     # Write back
-    with open(json_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    write_json(json_path, data)
     
     # Verify
-    with open(json_path, 'r') as f:
-        verify = json.load(f)
+    verify = json.loads(json_path.read_bytes())
     
     print("\n=== CONVERSION COMPLETE ===")
     print(f"Version: {verify['version']}")
@@ -4,17 +4,22 @@ Generate prefix_rules.json from dxcc_entities.json.
 This creates the authoritative source for prefix-to-DXCC mappings.
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
+from operator import itemgetter
+
+from _common import load_dxcc_entities, write_json
+
+# Single-character strings indexed by code point; callsign prefixes are
+# ASCII, so a range's middle characters are a slice of this table
+_ASCII = tuple(chr(c) for c in range(128))
 
 def main():
     base = Path(__file__).parent.parent
     json_path = base / "src-tauri" / "resources" / "dxcc_entities.json"
     output_path = base / "src-tauri" / "resources" / "prefix_rules.json"
     
-    with open(json_path, 'r') as f:
-        entities = json.load(f)
+    entities = load_dxcc_entities(json_path)
     
     rules = []
     ambiguous_prefixes = {}  # Track prefixes used by multiple entities
@@ -22,9 +27,7 @@ def main():
     # First pass: identify all prefixes and which entities use them
     for e in entities:
         entity_id = int(e['EntityId'])
-        name = e['Name']
         deleted = e.get('Deleted', False)
-        continent = e.get('Continent', '')
         
         if deleted:
             continue  # Skip deleted entities
@@ -49,52 +52,41 @@ def main():
                         start_mid = start[1]
                         end_mid = end[1]
                         suffix = start[2:]
-                        for c in range(ord(start_mid), ord(end_mid) + 1):
-                            expanded = f"{base_char}{chr(c)}{suffix}"
-                            if expanded not in ambiguous_prefixes:
-                                ambiguous_prefixes[expanded] = []
-                            ambiguous_prefixes[expanded].append({
-                                'entity_id': entity_id,
-                                'name': name,
-                                'continent': continent
-                            })
+                        for c in _ASCII[ord(start_mid):ord(end_mid) + 1]:
+                            expanded = base_char + c + suffix
+                            ambiguous_prefixes.setdefault(expanded, []).append((entity_id, e))
                 continue
             
-            if p not in ambiguous_prefixes:
-                ambiguous_prefixes[p] = []
-            ambiguous_prefixes[p].append({
-                'entity_id': entity_id,
-                'name': name,
-                'continent': continent
-            })
+            # (entity_id, entity row): the row is shared, not copied per prefix
+            ambiguous_prefixes.setdefault(p, []).append((entity_id, e))
     
     # Second pass: create rules
     for prefix, entities_list in sorted(ambiguous_prefixes.items()):
         if len(entities_list) == 1:
             # Unambiguous
-            e = entities_list[0]
+            entity_id, row = entities_list[0]
             rules.append({
                 'prefix': prefix,
-                'entity_id': e['entity_id'],
+                'entity_id': entity_id,
                 'priority': 10 + len(prefix) * 10,  # Longer prefixes = higher priority
                 'exact': False,
-                'comment': e['name']
+                'comment': row['Name']
             })
         else:
             # Ambiguous - need disambiguation rules
             # Add a comment-only entry to document the ambiguity
-            names = ', '.join([f"{e['entity_id']}={e['name']}" for e in entities_list])
+            names = ', '.join([f"{eid}={row['Name']}" for eid, row in entities_list])
             # Pick one as default (often the "mainland" or most common)
             # For now, pick the one with lowest entity_id as default
-            default = min(entities_list, key=lambda x: x['entity_id'])
+            default_id, default_row = min(entities_list, key=itemgetter(0))
             rules.append({
                 'prefix': prefix,
-                'entity_id': default['entity_id'],
+                'entity_id': default_id,
                 'priority': 10 + len(prefix) * 10,
                 'exact': False,
-                'comment': f"{default['name']} (AMBIGUOUS: also {names})",
+                'comment': f"{default_row['Name']} (AMBIGUOUS: also {names})",
                 'ambiguous': True,
-                'alternatives': [e['entity_id'] for e in entities_list if e['entity_id'] != default['entity_id']]
+                'alternatives': [eid for eid, _ in entities_list if eid != default_id]
             })
     
     # Add ITU block expansions that aren't in JSON but are valid
@@ -112,8 +104,7 @@ def main():
         'rules': rules
     }
     
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    write_json(output_path, output)
     
     print(f"Generated {len(rules)} prefix rules")
     print(f"  Ambiguous: {output['stats']['ambiguous']}")
@@ -19,11 +19,11 @@ import json
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from operator import itemgetter
 
 def load_prefix_rules(json_path: Path) -> dict:
     """Load prefix rules from JSON."""
-    with open(json_path, 'r') as f:
-        return json.load(f)
+    return json.loads(json_path.read_bytes())
 
 def group_rules_by_region(rules: list) -> dict:
     """Group rules by geographic region for organized output."""
@@ -55,7 +55,9 @@ def generate_rust_file(rules_data: dict, output_path: Path):
     
     # Sort rules: by prefix alphabetically, then by priority descending
     # This makes the file readable while lookup_callsign handles matching
-    sorted_rules = sorted(rules, key=lambda r: (r['prefix'], -r['priority']))
+    # Two stable passes: priority descending, then prefix
+    sorted_rules = sorted(rules, key=itemgetter('priority'), reverse=True)
+    sorted_rules.sort(key=itemgetter('prefix'))
     
     # Build Rust source
     lines = []
@@ -29,6 +29,8 @@ import os
 from datetime import datetime, timezone
 from pathlib import Path
 
+from _common import load_dxcc_entities
+
 # Determine paths relative to this script or src-tauri
 def get_project_paths():
     """Find project paths whether run from project root or src-tauri."""
@@ -58,8 +60,7 @@ def get_timestamp():
 def load_json(filename):
     """Load a JSON file from resources directory."""
     filepath = RESOURCES_DIR / filename
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return json.loads(filepath.read_bytes())
 
 def write_rust_file(filename, content):
     """Write content to a Rust file in the reference directory."""
@@ -74,7 +75,7 @@ def write_rust_file(filename, content):
 
 def generate_dxcc_rs():
     """Generate dxcc.rs from dxcc_entities.json."""
-    entities = load_json("dxcc_entities.json")
+    entities = load_dxcc_entities(RESOURCES_DIR / "dxcc_entities.json")
     timestamp = get_timestamp()
     
     # Count current vs deleted
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Run validate_prefixes.py and validate_prefix_rules.py together.
+
+dxcc_entities.json is parsed once and handed to both validators, which run
+one after the other in this process. Reports are printed in a fixed order
+and the exit code is non-zero if either validator fails.
+"""
+
+import sys
+
+import validate_prefix_rules
+import validate_prefixes
+from _common import load_dxcc_entities
+
+VALIDATORS = (validate_prefixes, validate_prefix_rules)
+
+def main():
+    entities = load_dxcc_entities(validate_prefixes.JSON_PATH)
+
+    results = [v.run(entities) for v in VALIDATORS]
+
+    out = []
+    for status, lines in results:
+        if out:
+            out.append("")
+        out.extend(lines)
+    sys.stdout.write("\n".join(out) + "\n")
+
+    return max(status for status, _ in results)
+
+if __name__ == "__main__":
+    exit(main())
@@ -5,18 +5,17 @@ This checks the JSON-to-JSON mappings, not the Rust code.
 """
 
 import json
+import sys
 from pathlib import Path
-from collections import defaultdict
 
-def main():
-    base = Path(__file__).parent.parent
-    entities_path = base / "src-tauri" / "resources" / "dxcc_entities.json"
-    rules_path = base / "src-tauri" / "resources" / "prefix_rules.json"
-    
-    # Load authoritative entity data
-    with open(entities_path, 'r') as f:
-        entities = json.load(f)
-    
+from _common import load_dxcc_entities
+
+BASE = Path(__file__).parent.parent
+JSON_PATH = BASE / "src-tauri" / "resources" / "dxcc_entities.json"
+RULES_PATH = BASE / "src-tauri" / "resources" / "prefix_rules.json"
+
+def run(entities: list[dict], rules_path: Path = RULES_PATH) -> tuple[int, list[str]]:
+    """Validate prefix_rules.json against parsed dxcc_entities.json. Returns (exit code, report lines)."""
     # Build entity lookups
     entity_by_id = {}
     active_entities = set()
@@ -24,6 +23,7 @@ def main():
         eid = int(e['EntityId'])
         entity_by_id[eid] = {
             'name': e['Name'],
+            'name_cf': e['Name'].casefold(),
             'deleted': e.get('Deleted', False),
             'prefixes': e.get('Prefixes'),
         }
@@ -31,25 +31,33 @@ def main():
             active_entities.add(eid)
     
     # Load prefix rules
-    with open(rules_path, 'r') as f:
-        rules_data = json.load(f)
+    rules_data = json.loads(rules_path.read_bytes())
     
     rules = rules_data['rules']
     
-    print(f"=== PREFIX RULES VALIDATION ===")
-    print(f"Active DXCC entities: {len(active_entities)}")
-    print(f"Total prefix rules: {len(rules)}")
-    print()
+    out = []
+    out.append(f"=== PREFIX RULES VALIDATION ===")
+    out.append(f"Active DXCC entities: {len(active_entities)}")
+    out.append(f"Total prefix rules: {len(rules)}")
+    out.append("")
     
     # Check for errors
     errors = []
     warnings = []
     covered_entities = set()
+    # prefix -> entity_ids, gathered in the same pass; a prefix lands in
+    # dupes when one of its entity_ids repeats
+    seen = {}
+    dupes = set()
     
     for rule in rules:
         prefix = rule['prefix']
         entity_id = rule['entity_id']
         comment = rule.get('comment', '')
+        ids = seen.setdefault(prefix, set())
+        if entity_id in ids:
+            dupes.add(prefix)
+        ids.add(entity_id)
         
         # Check if entity exists
         if entity_id not in entity_by_id:
@@ -66,7 +74,8 @@ def main():
         # Check if comment matches entity name
         if comment and comment != entity['name']:
             # Just a warning - names can have variations
-            if entity['name'].lower() not in comment.lower() and comment.lower() not in entity['name'].lower():
+            comment_cf = comment.casefold()
+            if entity['name_cf'] not in comment_cf and comment_cf not in entity['name_cf']:
                 warnings.append(f"  {prefix}: Comment '{comment}' doesn't match entity '{entity['name']}'")
         
         covered_entities.add(entity_id)
@@ -74,62 +83,66 @@ def main():
     # Check coverage
     missing_entities = active_entities - covered_entities
     
-    print(f"=== COVERAGE ===")
-    print(f"Entities with rules: {len(covered_entities)}/{len(active_entities)}")
-    print(f"Coverage: {100 * len(covered_entities) / len(active_entities):.1f}%")
-    print()
+    out.append(f"=== COVERAGE ===")
+    out.append(f"Entities with rules: {len(covered_entities)}/{len(active_entities)}")
+    out.append(f"Coverage: {100 * len(covered_entities) / len(active_entities):.1f}%")
+    out.append("")
     
     if missing_entities:
-        print(f"=== MISSING ENTITIES ({len(missing_entities)}) ===")
+        out.append(f"=== MISSING ENTITIES ({len(missing_entities)}) ===")
         for eid in sorted(missing_entities):
             e = entity_by_id[eid]
-            print(f"  {eid}: {e['name']} (prefixes: {e['prefixes']})")
-        print()
+            out.append(f"  {eid}: {e['name']} (prefixes: {e['prefixes']})")
+        out.append("")
     
     if errors:
-        print(f"=== ERRORS ({len(errors)}) ===")
+        out.append(f"=== ERRORS ({len(errors)}) ===")
         for err in errors:
-            print(err)
-        print()
+            out.append(err)
+        out.append("")
     
     if warnings:
-        print(f"=== WARNINGS ({len(warnings)}) ===")
+        out.append(f"=== WARNINGS ({len(warnings)}) ===")
         for w in warnings[:20]:
-            print(w)
+            out.append(w)
         if len(warnings) > 20:
-            print(f"  ... and {len(warnings) - 20} more")
-        print()
+            out.append(f"  ... and {len(warnings) - 20} more")
+        out.append("")
     
     # Check for duplicate prefix->entity pairs
-    seen = defaultdict(list)
-    for rule in rules:
-        key = rule['prefix']
-        seen[key].append(rule['entity_id'])
-    
-    duplicates = {k: v for k, v in seen.items() if len(v) != len(set(v))}
-    if duplicates:
-        print(f"=== DUPLICATE RULES ({len(duplicates)}) ===")
-        for prefix, eids in list(duplicates.items())[:10]:
-            print(f"  {prefix}: {eids}")
-        print()
+    if dupes:
+        out.append(f"=== DUPLICATE RULES ({len(dupes)}) ===")
+        # Report in first-seen order, listing every rule's entity_id
+        for prefix in [p for p in seen if p in dupes][:10]:
+            eids = [r['entity_id'] for r in rules if r['prefix'] == prefix]
+            out.append(f"  {prefix}: {eids}")
+        out.append("")
     
     # Final summary
-    print(f"=== SUMMARY ===")
-    print(f"Total rules: {len(rules)}")
-    print(f"Unique prefixes: {len(seen)}")
-    print(f"Coverage: {len(covered_entities)}/{len(active_entities)} entities ({100 * len(covered_entities) / len(active_entities):.1f}%)")
-    print(f"Errors: {len(errors)}")
-    print(f"Warnings: {len(warnings)}")
+    out.append(f"=== SUMMARY ===")
+    out.append(f"Total rules: {len(rules)}")
+    out.append(f"Unique prefixes: {len(seen)}")
+    out.append(f"Coverage: {len(covered_entities)}/{len(active_entities)} entities ({100 * len(covered_entities) / len(active_entities):.1f}%)")
+    out.append(f"Errors: {len(errors)}")
+    out.append(f"Warnings: {len(warnings)}")
     
     if len(errors) == 0 and len(covered_entities) == len(active_entities):
-        print("\n✅ VALIDATION PASSED: Full coverage, no errors")
-        return 0
+        out.append("\n✅ VALIDATION PASSED: Full coverage, no errors")
+        status = 0
     elif len(errors) == 0:
-        print(f"\n⚠️  VALIDATION WARNING: {len(missing_entities)} entities missing")
-        return 0
+        out.append(f"\n⚠️  VALIDATION WARNING: {len(missing_entities)} entities missing")
+        status = 0
     else:
-        print(f"\n❌ VALIDATION FAILED: {len(errors)} errors")
-        return 1
+        out.append(f"\n❌ VALIDATION FAILED: {len(errors)} errors")
+        status = 1
+    
+    return status, out
+
+def main():
+    entities = load_dxcc_entities(JSON_PATH)
+    status, out = run(entities)
+    sys.stdout.write("\n".join(out) + "\n")
+    return status
 
 if __name__ == "__main__":
     exit(main())
@@ -4,19 +4,55 @@ Validate prefix rules in prefixes.rs against authoritative dxcc_entities.json.
 Identifies mismatches between entity_id in code vs JSON.
 """
 
-import json
 import re
+import sys
 from pathlib import Path
 
-def main():
-    base = Path(__file__).parent.parent
-    json_path = base / "src-tauri" / "resources" / "dxcc_entities.json"
-    rs_path = base / "src-tauri" / "src" / "reference" / "prefixes.rs"
-    
-    # Load authoritative JSON
-    with open(json_path, 'r') as f:
-        entities = json.load(f)
-    
+from _common import load_dxcc_entities
+
+BASE = Path(__file__).parent.parent
+JSON_PATH = BASE / "src-tauri" / "resources" / "dxcc_entities.json"
+RS_PATH = BASE / "src-tauri" / "src" / "reference" / "prefixes.rs"
+
+# Match: PrefixRule { prefix: "XX", entity_id: NNN, ...
+_PREFIX_RULE_RE = re.compile(r'PrefixRule\s*\{\s*prefix:\s*"([^"]+)",\s*entity_id:\s*(\d+)')
+
+class TrieNode:
+    """Character trie node over JSON prefixes; entries is set where a prefix ends."""
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = None
+
+def build_prefix_trie(prefix_map: dict) -> TrieNode:
+    """Insert every prefix of prefix_map, keeping its entries at the end node."""
+    root = TrieNode()
+    for prefix, entries in prefix_map.items():
+        node = root
+        for ch in prefix:
+            child = node.children.get(ch)
+            if child is None:
+                child = node.children[ch] = TrieNode()
+            node = child
+        node.entries = entries
+    return root
+
+def base_prefix_entries(root: TrieNode, prefix: str) -> list:
+    """Entries of every shorter prefix of prefix that is in the trie, longest first."""
+    found = []
+    node = root
+    for ch in prefix[:-1]:
+        node = node.children.get(ch)
+        if node is None:
+            break
+        if node.entries is not None:
+            found.append(node.entries)
+    found.reverse()
+    return found
+
+def run(entities: list[dict], rs_path: Path = RS_PATH) -> tuple[int, list[str]]:
+    """Validate prefixes.rs against parsed dxcc_entities.json. Returns (exit code, report lines)."""
     # Build prefix -> entity_id map from JSON (authoritative)
     json_prefix_map = {}
     entity_name_map = {}
@@ -46,50 +82,51 @@ def main():
                 'deleted': deleted
             })
     
-    # Parse prefixes.rs for PrefixRule entries
-    with open(rs_path, 'r') as f:
-        rs_content = f.read()
+    # Collapse each prefix's entries into id sets once; names maps the active
+    # ids to entity names in JSON order
+    json_prefix_map = {
+        p: {
+            'active': frozenset(e['entity_id'] for e in entries if not e['deleted']),
+            'all': frozenset(e['entity_id'] for e in entries),
+            'names': {e['entity_id']: e['name'] for e in entries if not e['deleted']},
+        }
+        for p, entries in json_prefix_map.items()
+    }
     
-    # Match: PrefixRule { prefix: "XX", entity_id: NNN, ...
-    pattern = r'PrefixRule\s*\{\s*prefix:\s*"([^"]+)",\s*entity_id:\s*(\d+)'
-    rs_rules = re.findall(pattern, rs_content)
+    # Base-prefix lookups for disambiguation suffixes walk this once per rule
+    prefix_trie = build_prefix_trie(json_prefix_map)
     
-    print(f"=== DXCC PREFIX VALIDATION ===")
-    print(f"JSON entities: {len(entities)}")
-    print(f"JSON unique prefixes: {len(json_prefix_map)}")
-    print(f"Rust prefix rules: {len(rs_rules)}")
-    print()
+    # Parse prefixes.rs for PrefixRule entries
+    rs_content = rs_path.read_text()
     
-    # Validate each Rust rule
+    # Validate each Rust rule, matching them one at a time
     errors = []
     warnings = []
     validated = 0
     disambiguated = 0
+    rule_count = 0
     
-    for prefix, entity_id in rs_rules:
-        entity_id = int(entity_id)
+    for m in _PREFIX_RULE_RE.finditer(rs_content):
+        prefix = m.group(1)
+        entity_id = int(m.group(2))
+        rule_count += 1
         
         if prefix not in json_prefix_map:
             # Check if it's a disambiguation suffix (e.g., HK0M, VK9X)
             # Find base prefix
             base_found = False
-            for base_len in range(len(prefix)-1, 0, -1):
-                base = prefix[:base_len]
-                if base in json_prefix_map:
-                    # This is a disambiguation rule
-                    entries = json_prefix_map[base]
-                    valid_ids = [e['entity_id'] for e in entries if not e['deleted']]
-                    if entity_id in valid_ids:
-                        disambiguated += 1
+            for entry in base_prefix_entries(prefix_trie, prefix):
+                # This is a disambiguation rule
+                if entity_id in entry['active']:
+                    disambiguated += 1
+                    base_found = True
+                    break
+                else:
+                    # Check if it matches any entity with this base prefix
+                    if entity_id in entry['all']:
+                        warnings.append(f"  {prefix} -> {entity_id}: Maps to DELETED entity")
                         base_found = True
                         break
-                    else:
-                        # Check if it matches any entity with this base prefix
-                        all_ids = [e['entity_id'] for e in entries]
-                        if entity_id in all_ids:
-                            warnings.append(f"  {prefix} -> {entity_id}: Maps to DELETED entity")
-                            base_found = True
-                            break
             
             if not base_found:
                 # Truly unknown prefix - might be valid ITU allocation not in JSON
@@ -100,63 +137,74 @@ def main():
                     errors.append(f"  {prefix} -> {entity_id}: INVALID entity_id!")
         else:
             # Prefix exists in JSON - verify entity_id matches
-            entries = json_prefix_map[prefix]
-            active_entries = [e for e in entries if not e['deleted']]
+            entry = json_prefix_map[prefix]
+            active_ids = entry['active']
             
-            if len(active_entries) == 1:
+            if len(active_ids) == 1:
                 # Unambiguous - must match exactly
-                expected = active_entries[0]['entity_id']
+                expected, expected_name = next(iter(entry['names'].items()))
                 if entity_id != expected:
-                    errors.append(f"  {prefix} -> {entity_id} ({entity_name_map.get(entity_id, '?')}): MISMATCH! Expected {expected} ({active_entries[0]['name']})")
+                    errors.append(f"  {prefix} -> {entity_id} ({entity_name_map.get(entity_id, '?')}): MISMATCH! Expected {expected} ({expected_name})")
                 else:
                     validated += 1
-            elif len(active_entries) > 1:
+            elif len(active_ids) > 1:
                 # Ambiguous - entity_id must be one of the valid options
-                valid_ids = [e['entity_id'] for e in active_entries]
-                if entity_id in valid_ids:
+                if entity_id in active_ids:
                     disambiguated += 1
                 else:
-                    names = ', '.join([f"{e['entity_id']}={e['name']}" for e in active_entries])
+                    names = ', '.join([f"{eid}={name}" for eid, name in entry['names'].items()])
                     errors.append(f"  {prefix} -> {entity_id}: Not in valid set [{names}]")
             else:
                 # All entries are deleted
-                deleted_ids = [e['entity_id'] for e in entries]
-                if entity_id in deleted_ids:
+                if entity_id in entry['all']:
                     warnings.append(f"  {prefix} -> {entity_id}: Maps to DELETED entity")
                 else:
                     errors.append(f"  {prefix} -> {entity_id}: No active entity for this prefix")
     
+    out = []
+    out.append(f"=== DXCC PREFIX VALIDATION ===")
+    out.append(f"JSON entities: {len(entities)}")
+    out.append(f"JSON unique prefixes: {len(json_prefix_map)}")
+    out.append(f"Rust prefix rules: {rule_count}")
+    out.append("")
+    
     # Summary
-    print(f"=== VALIDATION RESULTS ===")
-    print(f"✅ Validated (exact match): {validated}")
-    print(f"✅ Disambiguated rules: {disambiguated}")
-    print(f"⚠️  Warnings: {len(warnings)}")
-    print(f"❌ Errors: {len(errors)}")
-    print()
+    out.append(f"=== VALIDATION RESULTS ===")
+    out.append(f"✅ Validated (exact match): {validated}")
+    out.append(f"✅ Disambiguated rules: {disambiguated}")
+    out.append(f"⚠️  Warnings: {len(warnings)}")
+    out.append(f"❌ Errors: {len(errors)}")
+    out.append("")
     
     if errors:
-        print("=== ERRORS (must fix) ===")
+        out.append("=== ERRORS (must fix) ===")
         for e in errors:
-            print(e)
-        print()
+            out.append(e)
+        out.append("")
     
     if warnings:
-        print("=== WARNINGS (review) ===")
+        out.append("=== WARNINGS (review) ===")
         for w in warnings[:20]:  # Limit output
-            print(w)
+            out.append(w)
         if len(warnings) > 20:
-            print(f"  ... and {len(warnings) - 20} more warnings")
-        print()
+            out.append(f"  ... and {len(warnings) - 20} more warnings")
+        out.append("")
     
     # Calculate accuracy
     total = validated + disambiguated + len(errors)
     if total > 0:
         accuracy = (validated + disambiguated) / total * 100
-        print(f"=== ACCURACY ===")
-        print(f"Correct rules: {validated + disambiguated}/{total} ({accuracy:.1f}%)")
+        out.append(f"=== ACCURACY ===")
+        out.append(f"Correct rules: {validated + disambiguated}/{total} ({accuracy:.1f}%)")
     
     # Return exit code
-    return 1 if errors else 0
+    return (1 if errors else 0), out
+
+def main():
+    entities = load_dxcc_entities(JSON_PATH)
+    status, out = run(entities)
+    sys.stdout.write("\n".join(out) + "\n")
+    return status
 
 if __name__ == "__main__":
     exit(main())